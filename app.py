@@ -7,9 +7,13 @@ from models.__init__ import Session
 from models.user import User
 from models.movies import Movies
 from models.user_movies import UserMovie
+import rate_limit
+import serialization
 
 app = Flask(__name__)
 CORS(app)  # Habilita CORS para todas as rotas
+rate_limit.init_app(app)  # Limita requisições por usuário/IP e a concorrência no SQLite
+serialization.init_app(app)  # JSON rápido (orjson), compressão opcional e métricas de payload
 
 # Swagger configuration
 SWAGGER_URL = '/api/docs'
@@ -23,6 +27,11 @@ swaggerui_blueprint = get_swaggerui_blueprint(
 )
 app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
 
+# Campos das listagens, na ordem usada pelo formato colunar (?format=columns)
+MOVIE_FIELDS = ("id", "title", "genre", "director", "year", "description", "cover")
+WATCHED_FIELDS = ("id", "movie_id", "title", "director", "year", "genre", "cover",
+                  "date_watched", "rating", "notes")
+
 
 # Rota Home
 @app.route('/')
@@ -36,6 +45,15 @@ def home():
     }), 200
 
 
+# Rota de métricas
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Expose rate limiting, admission control and payload counters"""
+    metrics = rate_limit.metrics(app)
+    metrics["serialization"] = serialization.metrics(app)
+    return jsonify(metrics), 200
+
+
 # Rotas User
 @app.route('/api/users', methods=['GET'])
 def get_all_users():
@@ -107,7 +125,7 @@ def get_all_movies():
         })
 
     session.close()
-    return jsonify(movies_list), 200
+    return serialization.list_response(movies_list, MOVIE_FIELDS), 200
 
 
 @app.route('/api/movies/<int:movie_id>', methods=['GET'])
@@ -351,7 +369,7 @@ def get_user_watched(user_id):
         })
 
     session.close()
-    return jsonify(watched), 200
+    return serialization.list_response(watched, WATCHED_FIELDS), 200
 
 
 @app.route('/api/users/<int:user_id>/watched', methods=['POST'])
@@ -0,0 +1,225 @@
+import threading
+import time
+from math import ceil
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import Flask, g, jsonify, request
+
+# Orçamento padrão por chave (user_id ou IP): (tokens por segundo, capacidade do balde)
+DEFAULT_BUDGET = (10.0, 20)
+
+# Orçamentos por rota, indexados pelo nome do endpoint Flask
+ROUTE_BUDGETS = {
+    'get_user_stats': (1.0, 5),
+    'get_user_watched': (5.0, 10),
+    'get_user_watchlist': (5.0, 10),
+    'get_all_movies': (5.0, 10),
+}
+
+# Limite global de requisições simultâneas tocando o SQLite
+MAX_CONCURRENT = 8
+# Quantas requisições podem aguardar uma vaga antes de receberem 503
+MAX_QUEUE = 16
+# Tempo máximo de espera por uma vaga (segundos)
+QUEUE_TIMEOUT = 2.0
+
+# Endpoints que não passam pelo controle de admissão
+EXEMPT_ENDPOINTS = {'static', 'home', 'get_metrics'}
+
+
+class TokenBucket:
+    """Token bucket refilled lazily on each consume call."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def consume(self, now: float) -> float:
+        """
+        Takes one token from the bucket.
+
+        Returns 0.0 when the token was granted, otherwise the number of
+        seconds until the next token becomes available.
+        """
+        elapsed = now - self.updated
+        self.updated = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+def default_key() -> str:
+    """Identifies the client by user_id (route or query string) or by IP."""
+    user_id = (request.view_args or {}).get('user_id') or request.args.get('user_id')
+    if user_id:
+        return f"user:{user_id}"
+    return f"ip:{request.remote_addr}"
+
+
+class RateLimiter:
+    """
+    In-process per-client rate limiter with per-route budgets.
+
+    Arguments:
+        key_func: Callable returning the client key for the current request.
+        default_budget: (rate, capacity) used for routes without a budget.
+        route_budgets: Mapping of endpoint name to (rate, capacity).
+        max_keys: Maximum number of buckets kept; the oldest is evicted first.
+    """
+
+    def __init__(self, key_func: Callable[[], str] = default_key,
+                 default_budget: Tuple[float, int] = DEFAULT_BUDGET,
+                 route_budgets: Optional[Dict[str, Tuple[float, int]]] = None,
+                 max_keys: int = 10000):
+        self.key_func = key_func
+        self.default_budget = default_budget
+        self.route_budgets = dict(ROUTE_BUDGETS if route_budgets is None else route_budgets)
+        self.max_keys = max_keys
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+
+    def hit(self, endpoint: str, key: str) -> float:
+        """
+        Records a request for (endpoint, key).
+
+        Returns 0.0 when allowed, otherwise the suggested retry delay in seconds.
+        """
+        bucket_key = (endpoint, key)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    # dicts preservam a ordem de inserção: remove o balde mais antigo
+                    del self._buckets[next(iter(self._buckets))]
+                rate, capacity = self.route_budgets.get(endpoint, self.default_budget)
+                bucket = self._buckets[bucket_key] = TokenBucket(rate, capacity)
+            wait = bucket.consume(now)
+            if wait:
+                self.rejected += 1
+            else:
+                self.allowed += 1
+        return wait
+
+    def stats(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "tracked_keys": len(self._buckets),
+        }
+
+
+class ConcurrencyLimiter:
+    """
+    Global cap on requests in flight, with a bounded wait queue.
+
+    Arguments:
+        max_concurrent: Requests allowed to run at the same time.
+        max_queue: Requests allowed to wait for a free slot.
+        timeout: Seconds a queued request waits before being rejected.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT,
+                 max_queue: int = MAX_QUEUE, timeout: float = QUEUE_TIMEOUT):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected = 0
+
+    def acquire(self) -> bool:
+        """Takes a slot, waiting in the queue if there is room. Returns False if rejected."""
+        if self._slots.acquire(blocking=False):
+            with self._lock:
+                self.in_flight += 1
+            return True
+
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                return False
+            self.queued += 1
+
+        acquired = self._slots.acquire(timeout=self.timeout)
+        with self._lock:
+            self.queued -= 1
+            if acquired:
+                self.in_flight += 1
+            else:
+                self.rejected += 1
+        return acquired
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "rejected": self.rejected,
+        }
+
+
+def init_app(app: Flask, limiter: Optional[RateLimiter] = None,
+             concurrency: Optional[ConcurrencyLimiter] = None) -> None:
+    """
+    Installs rate limiting and admission control on the application.
+
+    Requests over budget get 429, requests that find the database queue full
+    get 503; both carry a Retry-After header.
+    """
+    limiter = limiter or RateLimiter()
+    concurrency = concurrency or ConcurrencyLimiter()
+    app.extensions['rate_limiter'] = limiter
+    app.extensions['concurrency_limiter'] = concurrency
+
+    @app.before_request
+    def _admit():
+        endpoint = request.endpoint
+        if endpoint is None or endpoint in EXEMPT_ENDPOINTS or request.blueprint:
+            return None
+        if request.method == 'OPTIONS':
+            return None
+
+        wait = limiter.hit(endpoint, limiter.key_func())
+        if wait:
+            response = jsonify({"message": "Too many requests"})
+            response.status_code = 429
+            response.headers['Retry-After'] = str(max(1, ceil(wait)))
+            return response
+
+        if not concurrency.acquire():
+            response = jsonify({"message": "Server busy, try again later"})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(max(1, ceil(concurrency.timeout)))
+            return response
+        g.admitted = True
+        return None
+
+    @app.teardown_request
+    def _release(exc=None):
+        if g.pop('admitted', False):
+            concurrency.release()
+
+
+def metrics(app: Flask) -> dict:
+    """Returns the limiter counters registered on the application."""
+    return {
+        "rate_limiter": app.extensions['rate_limiter'].stats(),
+        "concurrency": app.extensions['concurrency_limiter'].stats(),
+    }
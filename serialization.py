@@ -0,0 +1,181 @@
+import gzip
+import threading
+import time
+import zlib
+from typing import List, Sequence
+
+from flask import Flask, current_app, g, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson é opcional
+    orjson = None
+
+# Compressão de respostas (desligada por padrão; habilite via app.config)
+COMPRESS_RESPONSES = False
+# Tamanho mínimo (bytes) para uma resposta ser comprimida
+COMPRESS_MIN_SIZE = 1024
+# Nível de compressão usado para gzip e deflate
+COMPRESS_LEVEL = 6
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes with orjson when it is installed and falls
+    back to the standard library otherwise.
+
+    Types orjson does not handle the way Flask does (dates, dataclasses,
+    decimals, ...) are passed to Flask's default hook, so the output matches
+    the stdlib provider.
+    """
+
+    def __init__(self, app: Flask):
+        super().__init__(app)
+        self.backend = "orjson" if orjson is not None else "json"
+
+    def _options(self) -> int:
+        options = (orjson.OPT_NON_STR_KEYS
+                   | orjson.OPT_PASSTHROUGH_DATETIME
+                   | orjson.OPT_PASSTHROUGH_DATACLASS)
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        start = time.perf_counter()
+        if orjson is None:
+            body = super().dumps(obj, **self._stdlib_args()).encode()
+        else:
+            body = orjson.dumps(obj, default=self.default, option=self._options())
+        g.json_encode = (time.perf_counter() - start, len(body))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+    def _stdlib_args(self) -> dict:
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return {"indent": 2}
+        return {"separators": (",", ":")}
+
+
+def list_response(items: List[dict], fields: Sequence[str]):
+    """
+    Serializes a list of rows.
+
+    With ?format=columns the field names are sent once, followed by one
+    array of values per row; otherwise the list of objects is returned as is.
+    """
+    if request.args.get('format') == 'columns':
+        g.response_format = 'columns'
+        return current_app.json.response({
+            "columns": list(fields),
+            "rows": [[item[field] for field in fields] for item in items]
+        })
+    g.response_format = 'rows'
+    return current_app.json.response(items)
+
+
+class PayloadStats:
+    """Payload size and encode time accumulated per response mode."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._modes = {}
+
+    def record(self, mode: str, encode_seconds: float, raw_bytes: int,
+               sent_bytes: int, compress_seconds: float = 0.0) -> None:
+        with self._lock:
+            entry = self._modes.get(mode)
+            if entry is None:
+                entry = self._modes[mode] = {
+                    "responses": 0,
+                    "raw_bytes": 0,
+                    "sent_bytes": 0,
+                    "encode_ms": 0.0,
+                    "compress_ms": 0.0,
+                }
+            entry["responses"] += 1
+            entry["raw_bytes"] += raw_bytes
+            entry["sent_bytes"] += sent_bytes
+            entry["encode_ms"] += encode_seconds * 1000
+            entry["compress_ms"] += compress_seconds * 1000
+
+    def stats(self) -> dict:
+        with self._lock:
+            modes = {mode: dict(entry) for mode, entry in self._modes.items()}
+        for entry in modes.values():
+            count = entry["responses"]
+            entry["avg_raw_bytes"] = entry["raw_bytes"] / count
+            entry["avg_sent_bytes"] = entry["sent_bytes"] / count
+            entry["avg_encode_ms"] = entry["encode_ms"] / count
+            entry["avg_compress_ms"] = entry["compress_ms"] / count
+        return modes
+
+
+def _compress(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=level)
+    return zlib.compress(data, level)
+
+
+def init_app(app: Flask) -> None:
+    """
+    Installs the JSON provider, optional response compression and payload metrics.
+
+    Compression is controlled by the COMPRESS_RESPONSES, COMPRESS_MIN_SIZE and
+    COMPRESS_LEVEL config keys.
+    """
+    app.json = FastJSONProvider(app)
+    app.config.setdefault('COMPRESS_RESPONSES', COMPRESS_RESPONSES)
+    app.config.setdefault('COMPRESS_MIN_SIZE', COMPRESS_MIN_SIZE)
+    app.config.setdefault('COMPRESS_LEVEL', COMPRESS_LEVEL)
+    payload_stats = app.extensions['payload_stats'] = PayloadStats()
+
+    @app.after_request
+    def _compress_response(response):
+        encoded = g.pop('json_encode', None)
+        if encoded is None or response.mimetype != app.json.mimetype:
+            return response
+        encode_seconds, raw_bytes = encoded
+        response_format = g.pop('response_format', 'object')
+        encoding = 'identity'
+        compress_seconds = 0.0
+
+        if (app.config['COMPRESS_RESPONSES']
+                and not response.direct_passthrough
+                and 'Content-Encoding' not in response.headers
+                and 200 <= response.status_code < 300):
+            response.vary.add('Accept-Encoding')
+            best = request.accept_encodings.best_match(['gzip', 'deflate'])
+            data = response.get_data()
+            if best and len(data) >= app.config['COMPRESS_MIN_SIZE']:
+                start = time.perf_counter()
+                response.set_data(_compress(data, best, app.config['COMPRESS_LEVEL']))
+                compress_seconds = time.perf_counter() - start
+                response.headers['Content-Encoding'] = best
+                encoding = best
+
+        payload_stats.record(f"{response_format}+{encoding}", encode_seconds,
+                             raw_bytes, response.content_length or 0, compress_seconds)
+        return response
+
+
+def metrics(app: Flask) -> dict:
+    """Returns the JSON backend and per-mode payload measurements."""
+    return {
+        "backend": app.json.backend,
+        "compression": app.config['COMPRESS_RESPONSES'],
+        "modes": app.extensions['payload_stats'].stats(),
+    }